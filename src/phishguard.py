@@ -1,8 +1,26 @@
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
-from Levenshtein import distance as levenshtein_distance
-
-import requests, ssdeep, argparse
+from selectolax.lexbor import LexborHTMLParser
+from urllib.parse import urljoin, urlsplit
+from rapidfuzz.distance import Levenshtein
+from rapidfuzz import process
+from requests.adapters import HTTPAdapter
+from collections import OrderedDict
+
+import requests, tlsh, argparse, asyncio, aiohttp, functools, html, re, tldextract, codecs, charset_normalizer
+import numpy as np
+
+# Matches the href value of an <a> tag in double, single or no quotes. Attributes before
+# href are consumed whole, so an 'href=' inside another attribute's quoted value never matches.
+_A_HREF_RE = re.compile(
+    rb'<a(?:\s+(?!href\s*=)[^\s=>]+(?:\s*=\s*(?:"[^"]*"|\'[^\']*\'|[^\s"\'>][^\s>]*))?)*'
+    rb'\s+href\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>][^\s>]*))',
+    re.IGNORECASE
+)
+
+# Number of downloaded pages each PhishGuard instance keeps in memory
+_PAGE_CACHE_SIZE = 256
+
+# Fragment links and link schemes that never point at a web page
+_SKIP_RE = re.compile(r'(?:#|mailto:|javascript:|tel:|data:|about:|blob:)', re.IGNORECASE)
 
 class PhishGuard:
     """
@@ -18,10 +36,50 @@ class PhishGuard:
             "https://www.twitter.com",
             "https://www.microsoft.com"
         ]
+
+        # Reuse pooled keep-alive connections across fetches instead of a new TCP+TLS handshake each time
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+        # Least-recently-used cache of downloaded pages, shared by every fetcher so the same URL is only fetched once.
+        # Each record holds the page's 'body', TLSH 'digest', declared text 'encoding' (None if undeclared) and word
+        # 'fingerprint' (filled in on first comparison), so one eviction policy covers them all.
+        self._pages: OrderedDict[str, dict] = OrderedDict()
+
+        # Resolve registrable domains against the bundled Public Suffix List snapshot, without fetching it remotely
+        self._tld = tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None)
+
+        # Pages link to the same few hosts over and over, so remember each host's base domain
+        self._base_of = functools.lru_cache(maxsize=4096)(self._extract_base)
+
+        # Canonical base domains, thresholds and score cutoff of each list of legitimate URLs, computed once per list.
+        # Keyed by the URLs themselves, so a reassigned or edited list never reuses stale bases.
+        self._legit_profile_cached = functools.lru_cache(maxsize=16)(self._legit_profile)
+
+        # Prime it for the default list so checks do no string work on legitimate data
+        self._legit_profile_cached(tuple(self.legitimate_domains))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Closes the underlying HTTP session and its pooled connections.
+        """
+        self._pages.clear()
+        self._base_of.cache_clear()
+        self._legit_profile_cached.cache_clear()
+        self._session.close()
     
     def fetch_html(self, url: str) -> str | None:
         """
         Fetches the HTML content from a given URL.
+        Successful responses are cached, so repeated calls for the same URL don't hit the network.
 
         Args:
             url (str): The suspicious or legitimate URL to check.
@@ -30,27 +88,215 @@ class PhishGuard:
             str or None: The HTML content as a string if successful, otherwise None.
         """
         try:
-            if not url:
-                raise ValueError("The URL provided is empty.")
+            page = self._fetch_page(url)
 
-            response = requests.get(url, timeout=10)
-            
-            # Raise an HTTPError for bad responses
-            response.raise_for_status()
+            # Like requests.Response.text, guess the encoding from the body when the response declared none
+            encoding = page['encoding'] or charset_normalizer.detect(page['body'])['encoding'] or 'utf-8'
+
+            return page['body'].decode(encoding, 'replace')
+
+        # Catch request-related errors
+        except requests.RequestException as e:
+            print(f"[!] Error fetching URL {url}: {e}")
+            return None
+
+    def fetch_and_hash(self, url: str) -> tuple[bytes, str] | None:
+        """
+        Fetches the raw body of a URL and computes its TLSH digest in the same streaming pass.
+        Shares its cache with fetch_html, so a page is downloaded once whichever is called first.
+
+        Args:
+            url (str): The suspicious or legitimate URL to check.
+
+        Returns:
+            tuple or None: The body as bytes and its TLSH digest if successful, otherwise None.
+        """
+        try:
+            page = self._fetch_page(url)
+
+            return page['body'], page['digest']
 
-            return response.text
-            
         # Catch request-related errors
         except requests.RequestException as e:
             print(f"[!] Error fetching URL {url}: {e}")
             return None
+
+    def _fetch_page(self, url: str) -> dict:
+        """
+        Returns the cached record of a page, downloading it first if it isn't cached.
+
+        Args:
+            url (str): The URL to fetch.
+
+        Returns:
+            dict: The page record.
+        """
+        page = self._cached_page(url)
+
+        if page is None:
+            page = self._fetch_page_uncached(url)
+
+        return page
+
+    def _cached_page(self, url: str) -> dict | None:
+        """
+        Looks up a page in the cache, marking it as recently used.
+
+        Args:
+            url (str): The URL the page was fetched from.
+
+        Returns:
+            dict or None: The page record if cached, otherwise None.
+        """
+        page = self._pages.get(url)
+
+        if page is not None:
+            self._pages.move_to_end(url)
+
+        return page
+
+    def _cached_page_for(self, url: str, html_content: bytes) -> dict | None:
+        """
+        Looks up a cached page, but only if its body is exactly the given content.
+        Caller-supplied HTML that differs from what was fetched never picks up another page's results.
+
+        Args:
+            url (str): The URL the page was fetched from.
+            html_content (bytes): The raw body of the page.
+
+        Returns:
+            dict or None: The page record if cached with this body, otherwise None.
+        """
+        page = self._cached_page(url)
+
+        if page is not None and (page['body'] is html_content or page['body'] == html_content):
+            return page
+
+        return None
+
+    def _fetch_page_uncached(self, url: str) -> dict:
+        """
+        Streams the body of a URL into a buffer and a TLSH hasher, raising on failure so errors are never cached.
+
+        Args:
+            url (str): The URL to download.
+
+        Returns:
+            dict: The page record.
+        """
+        if not url:
+            raise ValueError("The URL provided is empty.")
+
+        with self._session.get(url, timeout=10, stream=True) as response:
+            # Raise an HTTPError for bad responses
+            response.raise_for_status()
+
+            return self._store_page(url, response.iter_content(chunk_size=65536), response.encoding)
+
+    def _store_page(self, url: str, chunks, encoding: str | None) -> dict:
+        """
+        Builds the record of a downloaded page from its body chunks and caches it; the one path every fetcher goes through.
+
+        Args:
+            url (str): The URL the page was fetched from.
+            chunks (iterable of bytes): The body, in the order it was received.
+            encoding (str or None): The text encoding declared by the response, if any.
+
+        Returns:
+            dict: The page record.
+        """
+        body = bytearray()
+        hasher = tlsh.Tlsh()
+
+        # Hash each chunk as it arrives instead of decoding and re-encoding the whole page afterwards
+        for chunk in chunks:
+            body += chunk
+            hasher.update(chunk)
+
+        # Like requests.Response.text, fall back to UTF-8 for a declared charset Python has no codec for
+        if encoding is not None:
+            try:
+                codecs.lookup(encoding)
+            except LookupError:
+                encoding = 'utf-8'
+
+        page = {
+            'body': bytes(body),
+            'digest': self._finish_tlsh(hasher),
+            'encoding': encoding,
+            'fingerprint': None
+        }
+        self._pages[url] = page
+        self._pages.move_to_end(url)
+
+        # Evict the least recently used page once the cache is full
+        if len(self._pages) > _PAGE_CACHE_SIZE:
+            self._pages.popitem(last=False)
+
+        return page
+
+    async def fetch_many(self, urls: list[str]) -> dict[str, bytes | None]:
+        """
+        Fetches the raw bodies of several URLs concurrently over one shared session.
+        Pages already in the cache are not downloaded again, and new ones are cached the same way fetch_and_hash does.
+
+        Args:
+            urls (list[str]): The URLs to fetch.
+
+        Returns:
+            dict[str, bytes | None]: A mapping of each URL to its body, or None if the fetch failed.
+        """
+        bodies: dict[str, bytes | None] = {}
+
+        for url in urls:
+            page = self._cached_page(url)
+
+            if page is not None:
+                bodies[url] = page['body']
+
+        missing = [url for url in dict.fromkeys(urls) if url not in bodies]
+
+        if not missing:
+            return {url: bodies[url] for url in urls}
+
+        connector = aiohttp.TCPConnector(limit=100, limit_per_host=10, enable_cleanup_closed=True)
+        timeout = aiohttp.ClientTimeout(total=10)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+
+            async def fetch(url: str) -> bytes | None:
+                try:
+                    if not url:
+                        raise ValueError("The URL provided is empty.")
+
+                    async with session.get(url) as response:
+                        # Raise a ClientResponseError for bad responses
+                        response.raise_for_status()
+
+                        chunks = [chunk async for chunk in response.content.iter_chunked(65536)]
+                        encoding = requests.utils.get_encoding_from_headers(response.headers)
+
+                    return self._store_page(url, chunks, encoding)['body']
+
+                # Catch request-related errors
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                    print(f"[!] Error fetching URL {url}: {e}")
+                    return None
+
+            # Overlap the network round trips instead of waiting on each in turn
+            fetched = await asyncio.gather(*(fetch(url) for url in missing))
+
+        bodies.update(zip(missing, fetched))
+
+        return {url: bodies[url] for url in urls}
         
-    def extract_links(self, html_content: str) -> list:
+    def extract_links(self, html_content: str | bytes, strict: bool = False) -> list:
         """
         Parses HTML content to extract all URLs from <a> tags.
 
         Args:
-            html_content (str): The raw HTML content string.
+            html_content (str or bytes): The raw HTML content.
+            strict (bool): Use a full HTML parser instead of the regex scan, for badly malformed pages.
 
         Returns:
             list[str]: A list of all unique URLs found in the 'href' attributes.
@@ -58,22 +304,47 @@ class PhishGuard:
         try:
             if not html_content:
                 raise ValueError("The HTML content provided is empty.")
-            
-            # Initialize Beautiful Soup object
-            soup = BeautifulSoup(html_content, 'lxml')
 
-            # Find all <a> tags
-            all_a_tags = soup.find_all('a')
+            if strict:
+                return self._extract_links_parsed(html_content)
+
+            if isinstance(html_content, str):
+                html_content = html_content.encode('utf-8')
 
-            # Extract href attributes and ensure uniqueness
+            # One pass of the compiled regex over the raw bytes; exactly one group matches per tag
             links = {
-                tag.get('href') for tag in all_a_tags if tag.get('href')
+                html.unescape((a or b or c).decode('utf-8', 'replace'))
+                for a, b, c in _A_HREF_RE.findall(html_content) if a or b or c
             }
 
             return list(links)
         except Exception as e:
             print(f"[!] {e}")
             return []
+
+    def _extract_links_parsed(self, html_content: str | bytes) -> list:
+        """
+        Extracts all URLs from <a> tags by building a full HTML tree.
+
+        Args:
+            html_content (str or bytes): The raw HTML content.
+
+        Returns:
+            list[str]: A list of all unique URLs found in the 'href' attributes.
+        """
+        # Parse with the Lexbor C parser, which keeps the tree out of Python objects
+        tree = LexborHTMLParser(html_content)
+
+        # Select only <a> tags carrying an href attribute
+        all_a_tags = tree.css('a[href]')
+
+        # Extract href attributes and ensure uniqueness; attrs reads the one attribute
+        # lazily instead of copying every attribute of the tag into a dict, twice
+        links = {
+            href for tag in all_a_tags if (href := tag.attrs.get('href'))
+        }
+
+        return list(links)
     
     def analyze_links(self, links: list, base_url: str) -> list[str]:
         """
@@ -89,29 +360,22 @@ class PhishGuard:
         if not links:
             return []
         
-        # Automatically ensure links are unique
-        clean_links = set()
-        
-        for link in links:
-            # Filter out non-http links
-            if link.startswith(('#', 'mailto:', 'javascript:', 'tel:')):
-                continue
-
-            # Relative links to absolute using urljoin
-            absolute_link = urljoin(base_url, link)
-
-            # Add link to the set
-            clean_links.add(absolute_link)
+        # Filter out fragments and non-http links, turn relative links absolute
+        # using urljoin, and let the set ensure links are unique
+        clean_links = {
+            urljoin(base_url, link) for link in links if not _SKIP_RE.match(link)
+        }
 
         return list(clean_links)
     
-    def calculate_similarity(self, s1: str, s2: str) -> int:
+    def calculate_similarity(self, s1: str, s2: str, score_cutoff: int | None = None) -> int:
         """
         Calculates the Levenshtein distance between two strings (e.g., domain names).
 
         Args:
             s1 (str): The first string to compare.
             s2 (str): The second string to compare.
+            score_cutoff (int, optional): Largest distance of interest; anything further returns score_cutoff + 1.
 
         Returns:
             int: The Levenshtein distance (number of edits).
@@ -122,7 +386,8 @@ class PhishGuard:
                 return len(s1) + len(s2)
 
             # Convert to lowercase to ensure case-insensitive comparison (critical for domains)
-            dist = levenshtein_distance(s1.lower(), s2.lower()) # <-- .lower() added
+            # The cutoff lets the bit-parallel kernel stop early on clearly different strings
+            dist = Levenshtein.distance(s1.lower(), s2.lower(), score_cutoff=score_cutoff)
 
             return dist
 
@@ -131,13 +396,46 @@ class PhishGuard:
             # Return a large distance on failure
             return max(len(s1) + 1, len(s2) + 1)
 
-    def check_typo_squatting(self, target_url: str, legitimate_domains: list) -> list[str] | None:
+    def _extract_base(self, hostname: str) -> str:
+        """
+        Reduces a hostname to its registrable domain (e.g., 'www.google.co.uk' -> 'google.co.uk').
+
+        Args:
+            hostname (str): The hostname to reduce.
+
+        Returns:
+            str: The domain plus its public suffix, or the bare name for hosts without one (e.g., IPs, 'localhost').
+        """
+        ext = self._tld(hostname)
+
+        if ext.domain and ext.suffix:
+            return f"{ext.domain}.{ext.suffix}"
+
+        return ext.domain or hostname
+
+    def _legit_profile(self, legitimate_domains: tuple[str, ...]) -> tuple[list[str], np.ndarray, int]:
+        """
+        Computes the lowercased base domain and typo-squatting distance threshold of each legitimate URL.
+
+        Args:
+            legitimate_domains (tuple[str, ...]): The known legitimate URLs.
+
+        Returns:
+            tuple: The base domains, a numpy array of their matching thresholds, and the largest threshold.
+        """
+        bases = [self._base_of(urlsplit(url).netloc.lower()) for url in legitimate_domains]
+        thresholds = np.array([2 if len(base) <= 7 else 3 for base in bases])
+
+        return bases, thresholds, int(thresholds.max())
+
+    def check_typo_squatting(self, target_url: str, legitimate_domains: list, html_content: str | bytes | None = None) -> list[str] | None:
         """
         Checks if the target URL is a potential typo-squatting of any legitimate URLs.
 
         Args:
             target_url (str): The suspicious URL to check.
             legitimate_domains (list): A list of known legitimate URLs.
+            html_content (str or bytes, optional): Already-fetched HTML of the target URL. Fetched if not given.
         Returns:
             list[str]: A list of legitimate URLs that are similar to the target URL.
         """
@@ -145,7 +443,9 @@ class PhishGuard:
             if not target_url or not legitimate_domains:
                 raise ValueError("Target URL or legitimate URLs list is empty.")
 
-            html_content = self.fetch_html(target_url)
+            if html_content is None:
+                target_page = self.fetch_and_hash(target_url)
+                html_content = target_page[0] if target_page else None
 
             if not html_content:
                 print(f"[!] Could not proceed with analysis for {target_url}.")
@@ -158,26 +458,30 @@ class PhishGuard:
 
             suspicious_domains = set()
 
-            for link in clean_links:
-                hostname = urlparse(link).netloc
+            legit_bases, thresholds, cutoff = self._legit_profile_cached(tuple(legitimate_domains))
 
-                domain = hostname.split('.')[-2] + '.' + hostname.split('.')[-1] if hostname.count('.') > 1 and hostname.split('.')[-2] != 'co' else hostname
+            target_base = self._base_of(urlsplit(target_url).netloc.lower())
 
-                if domain == urlparse(target_url).netloc.split('.')[-2] + '.' + urlparse(target_url).netloc.split('.')[-1]:
-                    continue
+            # Collapse links sharing a domain before scoring, so each domain is compared only once
+            unique_domains = {self._base_of(urlsplit(link).netloc.lower()) for link in clean_links}
+            unique_domains.discard(target_base)
+            link_bases = list(unique_domains)
 
-                for legit_domain in legitimate_domains:
-                    legit_domain_base = legit_domain.lower().split('.')[-2] + '.' + legit_domain.lower().split('.')[-1]
-                    
-                    threshold = 2 if len(legit_domain_base) <= 7 else 3
-                    distance = self.calculate_similarity(domain, legit_domain_base)
+            if link_bases:
+                # Score every (link, legitimate) pair in one call; distances beyond the largest threshold are capped
+                matrix = process.cdist(
+                    link_bases, legit_bases,
+                    scorer=Levenshtein.distance,
+                    score_cutoff=cutoff,
+                    workers=-1
+                )
 
-                    if distance > 0 and distance <= threshold:
-                        warning = f"[!!! WARNING: TYPO SQUAT DETECTED !!!]\n"
-                        warning += f"   - Domain on Phishing Page: {domain}\n"
-                        warning += f"   - Resembles Legitimate Target: {legit_domain_base}\n"
-                        warning += f"   - Levenshtein Distance: {distance}"
-                        suspicious_domains.add(warning)
+                for i, j in np.argwhere((matrix > 0) & (matrix <= thresholds)):
+                    warning = f"[!!! WARNING: TYPO SQUAT DETECTED !!!]\n"
+                    warning += f"   - Domain on Phishing Page: {link_bases[i]}\n"
+                    warning += f"   - Resembles Legitimate Target: {legit_bases[j]}\n"
+                    warning += f"   - Levenshtein Distance: {matrix[i, j]}"
+                    suspicious_domains.add(warning)
 
             if suspicious_domains:
                 for warning in suspicious_domains:
@@ -190,44 +494,83 @@ class PhishGuard:
             print(f"[!] Typo-squatting check failed: {e}")
             return []
     
-    def compare_page_content(self, target_url: str, legitimate_url: str) -> bool:
+    def compare_page_content(self, target_url: str, legitimate_url: str, target_html: str | bytes | None = None) -> bool:
         """
         Compares the HTML content of the target URL with a legitimate URL.
 
         Args:
             target_url (str): The suspicious URL to check.
             legitimate_url (str): The known legitimate URL to compare against.
+            target_html (str or bytes, optional): Already-fetched HTML of the target URL. Fetched if not given.
 
         Returns:
             float or None: Similarity percentage between the two pages, or None on failure.
         """
         try:
-            target_html = self.fetch_html(target_url)
-            legit_html = self.fetch_html(legitimate_url)
+            # Each fetch also records the page's TLSH digest, so nothing is hashed twice
+            if target_html is None:
+                target_page = self.fetch_and_hash(target_url)
+                target_html = target_page[0] if target_page else None
+
+            legit_page = self.fetch_and_hash(legitimate_url)
+            legit_html = legit_page[0] if legit_page else None
+
+            return self.compare_page_content_html(target_html, legit_html, target_url, legitimate_url)
 
+        except Exception as e:
+            print(f"[!] Page content comparison failed: {e}")
+            return False
+
+    def compare_page_content_html(self, target_html: str | bytes | None, legit_html: str | bytes | None, target_url: str, legitimate_url: str) -> bool:
+        """
+        Compares already-fetched HTML content of the target URL with that of a legitimate URL.
+
+        Args:
+            target_html (str or bytes): The HTML content of the suspicious URL.
+            legit_html (str or bytes): The HTML content of the legitimate URL.
+            target_url (str): The suspicious URL, used for reporting.
+            legitimate_url (str): The legitimate URL, used for reporting.
+
+        Returns:
+            bool: True if the comparison ran, False on failure.
+        """
+        try:
             if not target_html or not legit_html:
                 raise ValueError(f"[!] Could not fetch HTML for comparison between {target_url} and {legitimate_url}.")
 
-            # Simple similarity metric: ratio of common substrings to total length
-            target_set = set(target_html.split())
-            legit_set = set(legit_html.split())
+            # Work on raw bytes, as fetched; encode once if given decoded text
+            if isinstance(target_html, str):
+                target_html = target_html.encode('utf-8')
+            if isinstance(legit_html, str):
+                legit_html = legit_html.encode('utf-8')
 
-            common_words = target_set.intersection(legit_set)
-            total_words = target_set.union(legit_set)
+            # Simple similarity metric: ratio of common words to all distinct words
+            target_words = self._fingerprint_of(target_url, target_html)
+            legit_words = self._fingerprint_of(legitimate_url, legit_html)
 
-            similarity_percentage = (len(common_words) / len(total_words)) * 100 if total_words else 0.0
+            common_words = np.intersect1d(target_words, legit_words, assume_unique=True).size
+            total_words = target_words.size + legit_words.size - common_words
 
-            target_hash = ssdeep.hash(target_html)
-            legit_hash = ssdeep.hash(legit_html)
+            similarity_percentage = (common_words / total_words) * 100 if total_words else 0.0
 
-            score = ssdeep.compare(target_hash, legit_hash)
+            target_hash = self._tlsh_of(target_url, target_html)
+            legit_hash = self._tlsh_of(legitimate_url, legit_html)
 
-            if score > 50:
-                print(f"[!!! WARNING: HIGH CONTENT SIMILARITY DETECTED !!!]")
-                print(f"   - Target URL: {target_url}")
-                print(f"   - Legitimate URL: {legitimate_url}")
-                print(f"   - SSDEEP Similarity Score: {score}")
-                print(f"   - Word-based Similarity Percentage: {similarity_percentage:.2f}%")
+            # TLSH can't digest pages that are too short or too uniform
+            if target_hash == "TNULL" or legit_hash == "TNULL":
+                raise ValueError(f"[!] Not enough content to compare {target_url} and {legitimate_url}.")
+
+            # TLSH distance: 0 means identical, lower is more similar
+            score = tlsh.diff(target_hash, legit_hash)
+
+            if score < 100:
+                warning = f"[!!! WARNING: HIGH CONTENT SIMILARITY DETECTED !!!]\n"
+                warning += f"   - Target URL: {target_url}\n"
+                warning += f"   - Legitimate URL: {legitimate_url}\n"
+                warning += f"   - TLSH Distance: {score}\n"
+                warning += f"   - Word-based Similarity Percentage: {similarity_percentage:.2f}%"
+
+                print(warning)
 
             return True
 
@@ -235,6 +578,77 @@ class PhishGuard:
             print(f"[!] Page content comparison failed: {e}")
             return False
     
+    def _fingerprint_of(self, url: str, html_content: bytes) -> np.ndarray:
+        """
+        Returns the word fingerprint of a page, computing it at most once per cached page.
+
+        Args:
+            url (str): The URL the page was fetched from.
+            html_content (bytes): The raw body of the page.
+
+        Returns:
+            np.ndarray: The distinct word hashes, as int64.
+        """
+        page = self._cached_page_for(url, html_content)
+
+        # Caller-supplied HTML that isn't the cached page is fingerprinted but not kept
+        if page is None:
+            return self._fingerprint(html_content)
+
+        if page['fingerprint'] is None:
+            page['fingerprint'] = self._fingerprint(html_content)
+
+        return page['fingerprint']
+
+    def _fingerprint(self, html_content: bytes) -> np.ndarray:
+        """
+        Reduces a page to the sorted, unique 64-bit hashes of its whitespace-separated words.
+
+        Args:
+            html_content (bytes): The raw body of the page.
+
+        Returns:
+            np.ndarray: The distinct word hashes, as int64.
+        """
+        words = html_content.split()
+
+        return np.unique(np.fromiter(map(hash, words), dtype=np.int64, count=len(words)))
+
+    def _tlsh_of(self, url: str, html_content: bytes) -> str:
+        """
+        Returns the TLSH digest of a page, reusing the one recorded at fetch time if the content matches.
+
+        Args:
+            url (str): The URL the page was fetched from.
+            html_content (bytes): The raw body of the page.
+
+        Returns:
+            str: The TLSH digest of the page, or 'TNULL' if the page can't be digested.
+        """
+        page = self._cached_page_for(url, html_content)
+
+        if page is not None:
+            return page['digest']
+
+        return tlsh.hash(html_content)
+
+    def _finish_tlsh(self, hasher: tlsh.Tlsh) -> str:
+        """
+        Finalizes an incremental TLSH hasher.
+
+        Args:
+            hasher (tlsh.Tlsh): The hasher fed with the whole page.
+
+        Returns:
+            str: The TLSH digest, or 'TNULL' if the page was too short or too uniform to digest.
+        """
+        # final() rejects short input; hexdigest() rejects input without enough variation
+        try:
+            hasher.final()
+            return hasher.hexdigest()
+        except ValueError:
+            return "TNULL"
+
     def run_analysis(self, target_url: str):
         """
         Runs the full analysis on the target URL, including typo-squatting and content comparison.
@@ -244,11 +658,16 @@ class PhishGuard:
         """
         print(f"\n=== Starting Analysis for {target_url} ===")
 
-        self.check_typo_squatting(target_url, self.legitimate_domains)
+        # Fetch the target and every legitimate page concurrently, once
+        pages = asyncio.run(self.fetch_many([target_url] + self.legitimate_domains))
+        target_html = pages[target_url]
+
+        # An empty string (rather than None) keeps a failed fetch from being retried
+        self.check_typo_squatting(target_url, self.legitimate_domains, html_content=target_html or b"")
 
         print("\n--- Starting Content Similarity Check ---")
         for legit_url in self.legitimate_domains:
-            self.compare_page_content(target_url, legit_url)
+            self.compare_page_content_html(target_html, pages[legit_url], target_url, legit_url)
 
         print(f"=== Analysis Completed for {target_url} ===\n")
 
@@ -270,8 +689,8 @@ def main():
     args = parser.parse_args()
     
     # Initialize and run the analysis
-    phish_tool = PhishGuard()
-    phish_tool.run_analysis(args.target_url)
+    with PhishGuard() as phish_tool:
+        phish_tool.run_analysis(args.target_url)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file